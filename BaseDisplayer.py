@@ -6,6 +6,7 @@ class BaseDisplayer:
     
     Methods:
         display(): Visually show te current state of the puzzle as a matrix
+        finish(): Show the final state of the puzzle once the game is over
         
     """
     def __init__(self):
@@ -13,3 +14,6 @@ class BaseDisplayer:
 
     def display(self, grid):
         pass
+
+    def finish(self, grid):
+        pass
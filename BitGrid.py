@@ -0,0 +1,472 @@
+from Grid import vecIndex, UP, DOWN, LEFT, RIGHT
+
+# Move tables already built, one per grid side size
+moveTables = {}
+
+# Most entries of each line cache generation, keeps long-lived processes bounded
+defaultCacheLimit = 1 << 13
+
+# Largest grid side size whose rows fit a 16-bit key, their tables are built in full
+maxFullTableSize = 4
+
+class LineCache(dict):
+    """ Line cache class. Lookup table filled on first access of each key
+
+    Entries are kept in two generations so that the cache stays bounded in long-lived processes.
+    When the cache reaches its limit its entries become the previous generation and it starts
+    over, taking back from the previous generation the lines still in use; lines met early in a
+    game and never again are dropped at the next turnover.
+
+    Args:
+        build: Function computing the table entry for a missing key
+        limit: Most entries held in each generation
+
+    """
+    def __init__(self, build, limit = defaultCacheLimit):
+        self.build = build
+        self.limit = limit
+        self.previous = {}
+
+    def __missing__(self, key):
+        if len(self) >= self.limit:
+            self.previous = self.copy()
+            self.clear()
+
+        value = self.previous.get(key)
+
+        if value is None:
+            value = self.build(key)
+
+        self[key] = value
+
+        return value
+
+class MoveTable:
+    """ Move table class. Size-specialized lookup tables for packed boards
+
+    Every cell holds the tile exponent (2 = 1, 4 = 2, ...) in a fixed number of bits, so a whole
+    board is one integer. Rows are contiguous bit ranges and columns are the same cells read with
+    a stride of one row, which lets both be used directly as table keys without transposing.
+
+    Above 4x4 tables are filled on demand: a 5x5 row already spans 25 bits and a 6x6 row 36 bits,
+    far too many keys to precompute. Up to 4x4 cells are 4 bits wide and FullMoveTable tabulates
+    every row instead.
+
+    Args:
+        size: Puzzle grid side size
+        board: Packed board integer
+        dir: Selected move direction
+        key: Packed line (row or column) used as table key
+        stride: Bit distance between two consecutive cells of the line
+        reverse: Boolean. Line slides towards its last cell (yes, reverse = 1; no, reverse = 0)
+
+    Methods:
+        shift(): Apply the specified move to a packed board
+        slideLine(): Slide and merge the tiles of a packed line
+        emptyCells(): Get the column indices of the empty cells of a packed row
+        maxExponent(): Get the highest tile exponent of a packed row
+
+    """
+    def __init__(self, size):
+        self.size = size
+        self.bits = 4 if size <= maxFullTableSize else (size * size + 1).bit_length()
+        self.cellMask = (1 << self.bits) - 1
+        self.rowStride = size * self.bits
+        self.rowMask = (1 << self.rowStride) - 1
+        self.colMask = sum(self.cellMask << (i * self.rowStride) for i in range(size))
+        self.rowOffsets = tuple(i * self.rowStride for i in range(size))
+        self.colOffsets = tuple(j * self.bits for j in range(size))
+
+        self.lines = {
+            LEFT  : LineCache(lambda key: self.slideLine(key, self.bits, False)),
+            RIGHT : LineCache(lambda key: self.slideLine(key, self.bits, True)),
+            UP    : LineCache(lambda key: self.slideLine(key, self.rowStride, False)),
+            DOWN  : LineCache(lambda key: self.slideLine(key, self.rowStride, True)),
+        }
+        self.empty = LineCache(self.emptyCells)
+        self.rowMax = LineCache(self.maxExponent)
+
+    def shift(self, board, dir):
+        """ Apply the specified move to a packed board
+
+        Args:
+            board: Packed board integer
+            dir: Selected move direction
+
+        Returns: Packed board after moving it in the specified direction
+
+        """
+        line = self.lines[dir]
+        result = 0
+
+        if dir == LEFT or dir == RIGHT:
+            mask, offsets = self.rowMask, self.rowOffsets
+        else:
+            mask, offsets = self.colMask, self.colOffsets
+
+        for offset in offsets:
+            result |= line[(board >> offset) & mask] << offset
+
+        return result
+
+    def slideLine(self, key, stride, reverse):
+        """ Slide and merge the tiles of a packed line
+
+        Args:
+            key: Packed line (row or column) used as table key
+            stride: Bit distance between two consecutive cells of the line
+            reverse: Boolean. Line slides towards its last cell (yes, reverse = 1; no, reverse = 0)
+
+        Returns: Packed line after sliding and merging its tiles
+
+        """
+        cells = [(key >> (k * stride)) & self.cellMask for k in range(self.size)]
+
+        if reverse:
+            cells.reverse()
+
+        tiles = [c for c in cells if c]
+        merged = []
+        i = 0
+
+        while i < len(tiles):
+            if i + 1 < len(tiles) and tiles[i] == tiles[i+1] and tiles[i] < self.cellMask:
+                merged.append(tiles[i] + 1)
+                i += 2
+            else:
+                merged.append(tiles[i])
+                i += 1
+
+        merged += [0] * (self.size - len(merged))
+
+        if reverse:
+            merged.reverse()
+
+        return sum(c << (k * stride) for k, c in enumerate(merged))
+
+    def emptyCells(self, key):
+        """ Get the column indices of the empty cells of a packed row
+
+        Args:
+            key: Packed line (row or column) used as table key
+
+        Returns: Tuple of the column indices of the empty cells
+
+        """
+        return tuple(j for j in range(self.size) if not (key >> (j * self.bits)) & self.cellMask)
+
+    def maxExponent(self, key):
+        """ Get the highest tile exponent of a packed row
+
+        Args:
+            key: Packed line (row or column) used as table key
+
+        Returns: Highest tile exponent in the row (0 if the row is empty)
+
+        """
+        return max((key >> (j * self.bits)) & self.cellMask for j in range(self.size))
+
+class FullMoveTable(MoveTable):
+    """ Full move table class. Move table with every line precomputed, for boards up to 4x4
+
+    Cells are 4 bits wide, so a 4x4 row is a 16-bit key and the moves of all 65536 of them are
+    tabulated up front in lists indexed by the row. Columns keep their strided keys in bounded
+    caches as on larger boards, but a miss only gathers the column into a row key with a single
+    multiplication and reads the precomputed result. The row slid to the left is built from the
+    tables of shorter rows, and every other table derived from it. A cell holds exponents up to
+    15, so two 32768 tiles do not merge.
+
+    Args:
+        size: Puzzle grid side size
+
+    """
+    def __init__(self, size):
+        super().__init__(size)
+
+        # Multiplying a column by colGather moves its cell i to bit colShift + i * bits, the other
+        # partial products land outside of those bits without overlapping each other
+        step = self.rowStride - self.bits
+        colShift = (size - 1) * step
+        colGather = sum(1 << (colShift - i * step) for i in range(size))
+        rowMask = self.rowMask
+
+        cellValues = range(1 << self.bits)
+
+        # Tables of the rows of m cells, for m = 0 to size, indexed by row key with the first cell
+        # in the low bits: row slid to the left, first tile, key of the cells after the first
+        # tile, key with the cells reversed and cells spread as a column. A row of m cells is a
+        # first cell a followed by a row of m - 1 cells, so the entries sharing a first cell are
+        # a strided slice computed from the whole table of m - 1 cells at once
+        slid, first, after, reverse, spread = [0], [0], [0], [0], [0]
+
+        for m in range(1, size + 1):
+            count = len(slid)
+            rows = [[0] * (count << self.bits) for i in range(5)]
+            slidTails = list(map(self.bits.__rlshift__, slid))
+            mergedTails = list(map(slidTails.__getitem__, after))
+            spreadTails = list(map(self.rowStride.__rlshift__, spread))
+            byFirst = [[] for a in cellValues]
+
+            for rest, tile in enumerate(first):
+                byFirst[tile].append(rest)
+
+            for a in cellValues:
+                entries = slice(a, None, 1 << self.bits)
+
+                if a:
+                    line = list(map(a.__or__, slidTails))
+
+                    if a < self.cellMask:
+                        for rest in byFirst[a]:
+                            line[rest] = a + 1 + mergedTails[rest]
+
+                    rows[0][entries] = line
+                    rows[1][entries] = [a] * count
+                    rows[2][entries] = range(count)
+                else:
+                    rows[0][entries] = slid
+                    rows[1][entries] = first
+                    rows[2][entries] = after
+
+                rows[3][entries] = map((a << (m - 1) * self.bits).__or__, reverse)
+                rows[4][entries] = map(a.__or__, spreadTails)
+
+            slid, first, after, reverse, spread = rows
+
+        right = list(map(reverse.__getitem__, map(slid.__getitem__, reverse)))
+
+        up = list(map(spread.__getitem__, slid))
+        down = list(map(spread.__getitem__, right))
+
+        self.lines = {
+            LEFT  : slid,
+            RIGHT : right,
+            UP    : LineCache(lambda key: up[key * colGather >> colShift & rowMask]),
+            DOWN  : LineCache(lambda key: down[key * colGather >> colShift & rowMask]),
+        }
+
+def getMoveTable(size):
+    """ Get the move table for the specified grid side size, building it on first use
+
+    Args:
+        size: Puzzle grid side size
+
+    Returns: MoveTable class object shared by all boards of that size
+
+    """
+    table = moveTables.get(size)
+
+    if table is None:
+        table = moveTables[size] = FullMoveTable(size) if size <= maxFullTableSize else MoveTable(size)
+
+    return table
+
+class BitGrid:
+    """ Bit Grid class. Packed-integer board with the same interface as Grid
+
+    Args:
+        size: Puzzle grid side size
+        board: Packed board integer
+        pos: Selected cell's grid position
+        value: Value for the computer's new tile to be inserted
+        dir: Selected move direction
+        dirs: Vector defining possible moves in the current puzzle state
+
+    Methods:
+        clone(): Make a copy of the grid in the current puzzle state
+        toGrid(): Convert the packed board back to a list-of-lists Grid
+        insertTile(): Insert a tile in an empty cell
+        setCellValue(): Set the new value for the selected cell
+        getAvailableCells(): Get a list of all empty cells
+        getMaxTile(): Return the tile with maximum value
+        canInsert(): Check if it is possible to insert a tile in the specified position
+        move(): Move the grid
+        canMove(): Check if the grid has available moves in the current puzzle state
+        getAvailableMoves(): Get the available moves in the current puzzle state
+        crossBound(): Check that the specified position is within the grid (size) limits
+        getCellValue(): Get the current value of the tile in the specified position
+
+    """
+    def __init__(self, size = 4, board = 0):
+        self.size = size
+        self.board = board
+        self.table = getMoveTable(size)
+
+    @property
+    def map(self):
+        """ Matrix of tile values. Read-only snapshot, use setCellValue() to change a cell """
+        return [[self.getCellValue((x, y)) for y in range(self.size)] for x in range(self.size)]
+
+    def clone(self):
+        """ Make a copy of the grid in the current puzzle state
+
+        Returns: Copy of the current bit grid class object
+
+        """
+        return BitGrid(self.size, self.board)
+
+    def toGrid(self):
+        """ Convert the packed board back to a list-of-lists Grid
+
+        Returns: Grid class object with the same puzzle state
+
+        """
+        from Grid import Grid
+
+        grid = Grid(self.size)
+        grid.map = self.map
+
+        return grid
+
+    def insertTile(self, pos, value):
+        """ Insert a tile in an empty cell
+
+        Args:
+            pos: Selected random position for the computer's new tile to be inserted
+            value: Value for the computer's new tile to be inserted
+
+        """
+        self.setCellValue(pos, value)
+
+    def setCellValue(self, pos, value):
+        """ Set the new value for the selected cell
+
+        Args:
+            pos: Selected random position for the computer's new tile to be inserted
+            value: Value for the computer's new tile to be inserted
+
+        """
+        shift = pos[0] * self.table.rowStride + pos[1] * self.table.bits
+        exponent = int(value).bit_length() - 1 if value else 0
+
+        if exponent > self.table.cellMask:
+            raise ValueError("tile %d does not fit a packed %dx%d board" % (value, self.size, self.size))
+
+        self.board = (self.board & ~(self.table.cellMask << shift)) | (exponent << shift)
+
+    def getAvailableCells(self):
+        """ Get a list of all empty cells
+
+        Returns: List of all empty cells
+
+        """
+        board, mask, empty = self.board, self.table.rowMask, self.table.empty
+        cells = []
+
+        for x, offset in enumerate(self.table.rowOffsets):
+            for y in empty[(board >> offset) & mask]:
+                cells.append((x, y))
+
+        return cells
+
+    def getMaxTile(self):
+        """ Return the tile with maximum value
+
+        Returns: Value of the highest tile in the current puzzle state
+
+        """
+        board, mask, rowMax = self.board, self.table.rowMask, self.table.rowMax
+        exponent = max(rowMax[(board >> offset) & mask] for offset in self.table.rowOffsets)
+
+        return 1 << exponent if exponent else 0
+
+    def canInsert(self, pos):
+        """ Check if it is possible to insert a tile in the specified position
+
+        Args:
+            pos: Selected random position for the computer's new tile to be inserted
+
+        Returns: Boolean whether specified position is available (available = True; unavailable = False)
+
+        """
+        return self.getCellValue(pos) == 0
+
+    def move(self, dir):
+        """ Move the grid
+
+        Args:
+            dir: Selected move direction
+
+        Returns: Boolean whether the grid has been successfully moved or not
+
+        """
+        board = self.table.shift(self.board, int(dir))
+        moved = board != self.board
+        self.board = board
+
+        return moved
+
+    def canMove(self, dirs = vecIndex):
+        """ Check if the grid has available moves in the current puzzle state
+
+        Unlike Grid.canMove(), which answers True as soon as any cell is empty, only moves that
+        really change the grid count: an empty board, or one where none of dirs applies, has none.
+
+        Args:
+            dirs: Vector defining possible moves in the current puzzle state
+
+        Returns: Boolean whether there are available moves in the current puzzle state
+
+        """
+        for x in dirs:
+            if self.table.shift(self.board, x) != self.board:
+                return True
+
+        return False
+
+    def getAvailableMoves(self, dirs = vecIndex):
+        """ Get the available moves in the current puzzle state
+
+        Args:
+            dirs: Vector defining possible moves in the current puzzle state
+
+        Returns: List of available moves in the current puzzle state
+
+        """
+        return [x for x in dirs if self.table.shift(self.board, x) != self.board]
+
+    def crossBound(self, pos):
+        """ Check that the specified position is within the grid (size) limits
+
+        Args:
+            pos: Selected cell's grid position
+
+        Returns: Boolean whether specified position is within the grid (size) limits
+
+        """
+        return pos[0] < 0 or pos[0] >= self.size or pos[1] < 0 or pos[1] >= self.size
+
+    def getCellValue(self, pos):
+        """ Get the current value of the tile in the specified position
+
+        Args:
+            pos: Selected cell's grid position
+
+        Returns: Value of the tile in the specified position
+
+        """
+        if self.crossBound(pos):
+            return None
+
+        exponent = (self.board >> (pos[0] * self.table.rowStride + pos[1] * self.table.bits)) & self.table.cellMask
+
+        return 1 << exponent if exponent else 0
+
+def toBitGrid(grid):
+    """ Pack a list-of-lists Grid into a BitGrid
+
+    Args:
+        grid: Grid class object with the current state of the puzzle
+
+    Returns: BitGrid class object with the same puzzle state
+
+    """
+    bitGrid = BitGrid(grid.size)
+    values = grid.map
+
+    for x in range(grid.size):
+        for y in range(grid.size):
+            if values[x][y]:
+                bitGrid.setCellValue((x, y), values[x][y])
+
+    return bitGrid
@@ -1,6 +1,7 @@
 from BaseDisplayer import BaseDisplayer
-import platform
 import os
+import sys
+import time
 
 colorMap = {
     0 	  : 97 ,
@@ -22,6 +23,9 @@ colorMap = {
     65536 : 101,
 }
 
+# Color for tiles beyond 65536, only reachable on larger grids
+maxColor = 41
+
 cTemp = "\x1b[%dm%7s\x1b[0m "
 
 class Displayer(BaseDisplayer):
@@ -37,7 +41,7 @@ class Displayer(BaseDisplayer):
         
     """
     def __init__(self):
-        if "Windows" == platform.system():
+        if sys.platform == "win32":
             self.display = self.winDisplay
         else:
             self.display = self.unixDisplay
@@ -58,9 +62,11 @@ class Displayer(BaseDisplayer):
             grid: Grid class object with the current state of the puzzle
             
         """
+        values = grid.map
+
         for i in range(grid.size):
             for j in range(grid.size):
-                print("%6d  " % grid.map[i][j], end="")
+                print("%6d  " % values[i][j], end="")
             print("")
         print("")
 
@@ -71,17 +77,112 @@ class Displayer(BaseDisplayer):
             grid: Grid class object with the current state of the puzzle
             
         """
+        values = grid.map
+
         for i in range(3 * grid.size):
             for j in range(grid.size):
-                v = grid.map[int(i / 3)][j]
+                v = values[int(i / 3)][j]
 
                 if i % 3 == 1:
                     string = str(v).center(7, " ")
                 else:
                     string = " "
 
-                print(cTemp %  (colorMap[v], string), end="")
+                print(cTemp %  (colorMap.get(v, maxColor), string), end="")
             print("")
 
             if i % 3 == 2:
                 print("")
+
+class FrameDisplayer(BaseDisplayer):
+    """ Frame Displayer class. Incremental ANSI renderer for watching fast games
+
+    Each frame is built in a single buffer and written at once. The first frame draws the whole
+    board, later ones only move the cursor to the cells that changed since the last frame shown.
+    Frames arriving faster than the target frame rate are dropped, so the game never waits on
+    the terminal.
+
+    Args:
+        fps: Target frame rate. Frames beyond it are skipped
+        stream: Text stream the frames are written to
+        grid: Grid class object with the current state of the puzzle
+
+    Methods:
+        display(): Show the current state of the puzzle unless a frame was shown too recently. Inherited from Base Displayer
+        finish(): Show the final state of the puzzle and leave the cursor below it. Inherited from Base Displayer
+        render(): Write a frame with the cells changed since the last one
+
+    """
+    def __init__(self, fps = 30, stream = None):
+        self.interval = 1.0 / fps if fps > 0 else 0
+        self.stream = stream if stream is not None else sys.stdout
+        self.shown = None
+        self.lastFrame = None
+
+    def display(self, grid):
+        """ Show the current state of the puzzle unless a frame was shown too recently
+
+        Args:
+            grid: Grid class object with the current state of the puzzle
+
+        """
+        now = time.perf_counter()
+
+        if self.lastFrame is not None and now - self.lastFrame < self.interval:
+            return
+
+        self.lastFrame = now
+        self.render(grid)
+
+    def finish(self, grid):
+        """ Show the final state of the puzzle and leave the cursor below it
+
+        Args:
+            grid: Grid class object with the current state of the puzzle
+
+        """
+        self.render(grid)
+        self.shown = None
+        self.lastFrame = None
+
+    def render(self, grid):
+        """ Write a frame with the cells changed since the last one
+
+        Args:
+            grid: Grid class object with the current state of the puzzle
+
+        """
+        size = grid.size
+        values = grid.map
+        shown = self.shown
+
+        if shown is None or len(shown) != size:
+            # Clear the screen and draw every cell
+            buffer = ["\x1b[H\x1b[2J"]
+            shown = [[None] * size for i in range(size)]
+        else:
+            buffer = []
+
+        for i in range(size):
+            for j in range(size):
+                v = values[i][j]
+
+                if shown[i][j] == v:
+                    continue
+
+                color = colorMap.get(v, maxColor)
+                row, col = 4 * i + 1, 8 * j + 1
+
+                buffer.append("\x1b[%d;%dH" % (row, col) + cTemp % (color, " "))
+                buffer.append("\x1b[%d;%dH" % (row + 1, col) + cTemp % (color, str(v).center(7, " ")))
+                buffer.append("\x1b[%d;%dH" % (row + 2, col) + cTemp % (color, " "))
+
+                shown[i][j] = v
+
+        if buffer:
+            # Park the cursor below the board
+            buffer.append("\x1b[%d;1H" % (4 * size + 1))
+            self.stream.write("".join(buffer))
+            self.stream.flush()
+
+        self.shown = shown
@@ -1,7 +1,7 @@
 from Grid       import Grid
 from ComputerAI import ComputerAI
 from PlayerAI   import PlayerAI
-from Displayer  import Displayer
+from Displayer  import Displayer, FrameDisplayer
 from random     import randint
 import time
 
@@ -29,13 +29,16 @@ class GameManager:
         size: Puzzle grid side size
         ComputerAI: ComputerAI class object running the computer's moves
         PlayerAI: PlayerAI class object running the player's moves optimizing the implemented heuristics
-        displayer: Displayer class object allowing the Game Manager to display the current state of the game 
-        currTime: time.clock object indicating the current time at each move
+        displayer: Displayer class object allowing the Game Manager to display the current state of the game. None turns display off
+        verbose: Boolean. Print the turn-by-turn game log (yes, verbose = 1; no, verbose = 0)
+        currTime: time.perf_counter value indicating the current time at each move
     
     Methods:
         setComputerAI(): Set ComputerAI object
         setPlayerAI(): Set PlayerAI object
         setDisplayer(): Set Displayer object
+        setVerbose(): Turn the turn-by-turn game log on or off
+        log(): Print a game log message when verbose
         updateAlarm(): Check time consumed in the decision-making process doesn't exceed time limit
         start(): Start running the game
         isGameOver(): Check if the game is over, not allowing the player to perform any further moves
@@ -52,6 +55,7 @@ class GameManager:
         self.playerAI   = None
         self.displayer  = None
         self.over       = False
+        self.verbose    = True
 
     def setComputerAI(self, computerAI):
         """ Set ComputerAI object """
@@ -65,33 +69,45 @@ class GameManager:
         """ Set Displayer object """
         self.displayer = displayer
 
+    def setVerbose(self, verbose):
+        """ Turn the turn-by-turn game log on or off """
+        self.verbose = verbose
+
+    def log(self, *args, **kwargs):
+        """ Print a game log message when verbose """
+        if self.verbose:
+            print(*args, **kwargs)
+
     def updateAlarm(self, currTime):
         """ Check time consumed in the decision-making process doesn't exceed time limit 
         
         Args:
-            currTime: time.clock object indicating the current time at each move
+            currTime: time.perf_counter value indicating the current time at each move
                 
         """
         if currTime - self.prevTime > timeLimit + allowance:
             self.over = True
         else:
-            while time.clock() - self.prevTime < timeLimit + allowance:
+            while time.perf_counter() - self.prevTime < timeLimit + allowance:
                 pass
 
-            self.prevTime = time.clock()
+            self.prevTime = time.perf_counter()
 
     def start(self):
         """ Start running the game """
         for i in range(self.initTiles):
             self.insertRandomTile()
 
-        self.displayer.display(self.grid)
+        displayer = self.displayer
+
+        if displayer:
+            displayer.display(self.grid)
 
         # Player AI Goes First
         turn = PLAYER_TURN
         maxTile = 0
 
-        self.prevTime = time.clock()
+        self.prevTime = time.perf_counter()
 
         while not self.isGameOver() and not self.over:
             # Copy to Ensure AI Cannot Change the Real Grid to Cheat
@@ -100,9 +116,9 @@ class GameManager:
             move = None
 
             if turn == PLAYER_TURN:
-                print("Player's Turn:", end="")
+                self.log("Player's Turn:", end="")
                 move = self.playerAI.getMove(gridCopy)
-                print(actionDic[move])
+                self.log(actionDic.get(move))
 
                 # Validate Move
                 if move != None and move >= 0 and move < 4:
@@ -112,31 +128,35 @@ class GameManager:
                         # Update maxTile
                         maxTile = self.grid.getMaxTile()
                     else:
-                        print("Invalid PlayerAI Move")
+                        self.log("Invalid PlayerAI Move")
                         self.over = True
                 else:
-                    print("Invalid PlayerAI Move - 1")
+                    self.log("Invalid PlayerAI Move - 1")
                     self.over = True
             else:
-                print("Computer's turn:")
+                self.log("Computer's turn:")
                 move = self.computerAI.getMove(gridCopy)
 
                 # Validate Move
                 if move and self.grid.canInsert(move):
                     self.grid.setCellValue(move, self.getNewTileValue())
                 else:
-                    print("Invalid Computer AI Move")
+                    self.log("Invalid Computer AI Move")
                     self.over = True
 
-            if not self.over:
-                self.displayer.display(self.grid)
+            if displayer and not self.over:
+                displayer.display(self.grid)
             
-            print(self.over)
+            self.log(self.over)
             # Exceeding the Time Allotted for Any Turn Terminates the Game
-            self.updateAlarm(time.clock())
+            self.updateAlarm(time.perf_counter())
 
             turn = 1 - turn
-            print(self.over)
+            self.log(self.over)
+
+        if displayer:
+            displayer.finish(self.grid)
+
         print(maxTile)
 
     def isGameOver(self):
@@ -166,19 +186,50 @@ class GameManager:
         self.grid.setCellValue(cell, tileValue)
 
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play a 2048-puzzle game between the Player AI and the Computer AI")
+    parser.add_argument("--size", type=int, default=4, help="puzzle grid side size (default: 4)")
+    parser.add_argument("--display", choices=["full", "incremental", "none"], default="full",
+                        help="print every board, redraw changed cells in place (implies --quiet) or show nothing")
+    parser.add_argument("--fps", type=float, default=30, help="frame rate limit of the incremental display (default: 30)")
+    parser.add_argument("--quiet", action="store_true", help="do not print the turn-by-turn game log")
+    parser.add_argument("--player", choices=["minimax", "montecarlo"], default="minimax", help="Player AI engine (default: minimax)")
+    parser.add_argument("--workers", type=int, default=None, help="rollout processes of the montecarlo player (default: CPU count)")
+    parser.add_argument("--depth", type=int, default=None, help="moves per rollout of the montecarlo player (default: until game over)")
+    args = parser.parse_args()
+
     # Initialize main classes
-    gameManager = GameManager()
-    playerAI  	= PlayerAI()
+    gameManager = GameManager(args.size)
     computerAI  = ComputerAI()
-    displayer 	= Displayer()
+
+    if args.player == "montecarlo":
+        from MonteCarloAI import MonteCarloAI
+
+        playerAI = MonteCarloAI(workers = args.workers, depth = args.depth)
+    else:
+        playerAI = PlayerAI()
+
+    if args.display == "full":
+        displayer = Displayer()
+    elif args.display == "incremental":
+        displayer = FrameDisplayer(args.fps)
+    else:
+        displayer = None
 
     # Initial Game Manager set-up
     gameManager.setDisplayer(displayer)
+    gameManager.setVerbose(not args.quiet and args.display != "incremental")
+    playerAI.verbose = gameManager.verbose
     gameManager.setPlayerAI(playerAI)
     gameManager.setComputerAI(computerAI)
     
     # Start running the game
-    gameManager.start()
+    try:
+        gameManager.start()
+    finally:
+        if args.player == "montecarlo":
+            playerAI.close()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,467 @@
+from GameManager import GameManager, actionDic
+from ComputerAI  import ComputerAI
+from Grid        import Grid
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import stat
+import sys
+
+# Initialize static parameters
+defaultDeadline = 2.0
+defaultMaxSessions = 1024
+defaultMaxInFlight = 64
+defaultMaxSize = 16
+
+# PlayerAI's own decision time, shortened when a session deadline leaves less room
+defaultSearchTime = 0.2
+
+# Share of a step deadline given to the Player AI search, the rest covers the transfer to and from the worker
+searchShare = 0.5
+
+# Player AI living in each pool worker, created once per process
+workerPlayerAI = None
+
+def initWorker():
+    """ Silence pool workers, PlayerAI prints its search time and would corrupt the protocol stream """
+    sys.stdout = open(os.devnull, "w")
+
+def warmWorker():
+    """ Import the Player AI and build the default size move table in a pool worker so the first search does not pay for them """
+    import PlayerAI
+    from BitGrid import getMoveTable
+
+    getMoveTable(4)
+
+def searchMove(size, map, timeLimit):
+    """ Run a Player AI search inside a pool worker
+
+    Args:
+        size: Puzzle grid side size
+        map: Matrix of tile values of the current puzzle state
+        timeLimit: Maximum decision time of the Player AI in seconds
+
+    Returns: Player AI's next move
+
+    """
+    global workerPlayerAI
+
+    if workerPlayerAI is None:
+        from PlayerAI import PlayerAI
+
+        workerPlayerAI = PlayerAI()
+
+    grid = Grid(size)
+    grid.map = map
+    workerPlayerAI.timeLimit = timeLimit
+
+    return workerPlayerAI.getMove(grid)
+
+class SessionError(Exception):
+    """ Request that cannot be served, reported back to the client as an error response """
+
+class GameSession:
+    """ Game Session class
+
+    Args:
+        sessionId: Unique session identifier
+        size: Puzzle grid side size
+        deadline: Maximum seconds a single step may take, including the wait for a pool worker
+
+    Methods:
+        state(): Get a JSON-serializable summary of the session
+
+    """
+    def __init__(self, sessionId, size, deadline):
+        self.sessionId = sessionId
+        self.deadline = deadline
+        self.manager = GameManager(size)
+        self.computerAI = ComputerAI()
+        self.lock = asyncio.Lock()
+        self.closed = False
+        self.moves = 0
+        self.reason = None
+
+        for i in range(self.manager.initTiles):
+            self.manager.insertRandomTile()
+
+    def state(self):
+        """ Get a JSON-serializable summary of the session
+
+        Returns: Dictionary with the board, max tile, move count and game over status
+
+        """
+        grid = self.manager.grid
+
+        return {
+            "id"      : self.sessionId,
+            "size"    : grid.size,
+            "map"     : grid.map,
+            "maxTile" : grid.getMaxTile(),
+            "moves"   : self.moves,
+            "over"    : self.manager.over,
+            "reason"  : self.reason,
+        }
+
+class GameServer:
+    """ Game Server class. Drives many GameManager sessions from one asyncio event loop
+
+    Player AI searches run in a shared process pool, at most one per worker: the others wait
+    for a free slot on the event loop, and each stream stops reading new requests while
+    maxInFlight of its own are pending, so clients feel backpressure instead of growing
+    unbounded queues. A search keeps its slot until the pool worker has really finished it,
+    even when the step waiting for it gave up, so abandoned searches cannot pile up in the pool.
+    The session deadline starts once the search holds a slot, waiting for one never ends a game.
+    A search exceeding the deadline ends that game, the same rule GameManager applies to a slow
+    Player AI.
+
+    Args:
+        pool: Executor running the Player AI searches
+        workers: Number of pool workers, searches running at once
+        maxSessions: Maximum number of simultaneously open sessions
+        maxInFlight: Maximum number of pending requests per stream
+        deadline: Default maximum seconds per step
+        maxSize: Largest puzzle grid side size a session may use
+        request: Decoded JSON request
+        reader: asyncio StreamReader of the client stream
+        writer: asyncio StreamWriter of the client stream
+
+    Methods:
+        handle(): Dispatch a decoded request and build its response
+        create(): Open a new game session
+        step(): Play one full turn (player move and computer tile) of a session
+        getState(): Get the state of a session
+        close(): Close a session
+        serveStream(): Serve newline-delimited JSON requests from a stream
+
+    """
+    def __init__(self, pool, workers, maxSessions = defaultMaxSessions, maxInFlight = defaultMaxInFlight, deadline = defaultDeadline, maxSize = defaultMaxSize):
+        self.pool = pool
+        self.maxSessions = maxSessions
+        self.maxInFlight = maxInFlight
+        self.deadline = deadline
+        self.maxSize = maxSize
+        self.sessions = {}
+        self.searchSlots = asyncio.Semaphore(workers)
+        self.ids = itertools.count(1)
+
+    async def handle(self, request):
+        """ Dispatch a decoded request and build its response
+
+        Args:
+            request: Decoded JSON request
+
+        Returns: JSON-serializable response
+
+        """
+        ops = {"create": self.create, "step": self.step, "state": self.getState, "close": self.close}
+
+        try:
+            if not isinstance(request, dict) or request.get("op") not in ops:
+                raise SessionError("unknown op")
+
+            response = await ops[request["op"]](request)
+            response["ok"] = True
+        except SessionError as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:
+            # Every request gets an answer, clients wait on their tags
+            response = {"ok": False, "error": "internal error: %s: %s" % (type(e).__name__, e)}
+
+        if isinstance(request, dict) and "tag" in request:
+            response["tag"] = request["tag"]
+
+        return response
+
+    def getSession(self, request):
+        """ Get the session addressed by a request """
+        sessionId = request.get("id")
+        session = self.sessions.get(sessionId) if isinstance(sessionId, str) else None
+
+        if session is None or session.closed:
+            raise SessionError("unknown session")
+
+        return session
+
+    async def create(self, request):
+        """ Open a new game session """
+        if len(self.sessions) >= self.maxSessions:
+            raise SessionError("too many sessions")
+
+        try:
+            size = int(request.get("size", 4))
+            deadline = float(request.get("deadline", self.deadline))
+        except (TypeError, ValueError):
+            raise SessionError("invalid size or deadline")
+
+        if size < 2 or not deadline > 0:
+            raise SessionError("invalid size or deadline")
+
+        if size > self.maxSize:
+            raise SessionError("size above %d" % self.maxSize)
+
+        session = GameSession(str(next(self.ids)), size, deadline)
+        self.sessions[session.sessionId] = session
+
+        return session.state()
+
+    async def step(self, request):
+        """ Play one full turn (player move and computer tile) of a session """
+        session = self.getSession(request)
+
+        async with session.lock:
+            manager = session.manager
+
+            if session.closed:
+                raise SessionError("unknown session")
+
+            if manager.over or manager.isGameOver():
+                manager.over = True
+                raise SessionError("game over")
+
+            try:
+                move = await self.search(manager.grid, session.deadline)
+            except asyncio.TimeoutError:
+                manager.over = True
+                session.reason = "deadline exceeded"
+
+                return session.state()
+
+            if move is None or not manager.grid.canMove([move]):
+                manager.over = True
+                session.reason = "invalid player move"
+
+                return session.state()
+
+            manager.grid.move(move)
+            session.moves += 1
+
+            cell = session.computerAI.getMove(manager.grid.clone())
+
+            if cell:
+                manager.grid.setCellValue(cell, manager.getNewTileValue())
+
+            if manager.isGameOver():
+                manager.over = True
+                session.reason = "no moves left"
+
+            response = session.state()
+            response["move"] = actionDic[move]
+
+            return response
+
+    async def search(self, grid, deadline):
+        """ Run a Player AI search in the pool once a search slot is free
+
+        The deadline only counts from the moment the slot is taken, time spent queued behind
+        other sessions is backpressure and not a slow Player AI. The slot is released when the
+        pool future completes, not when this coroutine ends: a running search cannot be
+        cancelled and keeps its worker busy after a timeout.
+
+        """
+        await self.searchSlots.acquire()
+        loop = asyncio.get_running_loop()
+
+        try:
+            future = self.pool.submit(searchMove, grid.size, grid.map, min(defaultSearchTime, deadline * searchShare))
+        except BaseException:
+            self.searchSlots.release()
+            raise
+
+        def releaseSlot(future):
+            try:
+                loop.call_soon_threadsafe(self.searchSlots.release)
+            except RuntimeError:
+                # Event loop already closed
+                pass
+
+        future.add_done_callback(releaseSlot)
+
+        return await asyncio.wait_for(asyncio.wrap_future(future), deadline)
+
+    async def getState(self, request):
+        """ Get the state of a session """
+        return self.getSession(request).state()
+
+    async def close(self, request):
+        """ Close a session once its running step, if any, is over """
+        session = self.getSession(request)
+
+        async with session.lock:
+            if session.closed:
+                raise SessionError("unknown session")
+
+            session.closed = True
+            del self.sessions[session.sessionId]
+
+            return session.state()
+
+    async def serveStream(self, reader, writer):
+        """ Serve newline-delimited JSON requests from a stream
+
+        Requests are handled concurrently and answered as they complete, a "tag" field in the
+        request is echoed back to match responses to requests.
+
+        Args:
+            reader: asyncio StreamReader of the client stream
+            writer: asyncio StreamWriter of the client stream
+
+        """
+        pending = asyncio.Semaphore(self.maxInFlight)
+        tasks = set()
+
+        async def answer(line):
+            try:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"ok": False, "error": "invalid json"}
+                else:
+                    response = await self.handle(request)
+
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+            finally:
+                pending.release()
+
+        while True:
+            await pending.acquire()
+            line = await reader.readline()
+
+            if not line:
+                pending.release()
+                break
+
+            if not line.strip():
+                pending.release()
+                continue
+
+            task = asyncio.ensure_future(answer(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        writer.close()
+
+def isPipe(stream):
+    """ Check if a standard stream can use asyncio pipe transports (pipe, socket or terminal) """
+    mode = os.fstat(stream.fileno()).st_mode
+
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stat.S_ISCHR(mode)
+
+class FileReader:
+    """ File Reader class. StreamReader stand-in for redirected regular files
+
+    Args:
+        file: Binary file the lines are read from
+
+    Methods:
+        readline(): Read the next line in the default executor
+
+    """
+    def __init__(self, file):
+        self.file = file
+
+    async def readline(self):
+        """ Read the next line in the default executor """
+        return await asyncio.get_running_loop().run_in_executor(None, self.file.readline)
+
+class FileWriter:
+    """ File Writer class. StreamWriter stand-in for redirected regular files
+
+    Args:
+        file: Binary file the responses are written to
+        data: Bytes to write
+
+    Methods:
+        write(): Write bytes to the file
+        drain(): Flush the file
+        close(): Flush the file
+
+    """
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, data):
+        """ Write bytes to the file """
+        self.file.write(data)
+
+    async def drain(self):
+        """ Flush the file """
+        self.file.flush()
+
+    def close(self):
+        """ Flush the file """
+        self.file.flush()
+
+async def serveStdio(server):
+    """ Serve requests read from stdin, writing responses to stdout
+
+    Args:
+        server: GameServer class object
+
+    """
+    loop = asyncio.get_running_loop()
+
+    if isPipe(sys.stdin):
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    else:
+        reader = FileReader(sys.stdin.buffer)
+
+    if isPipe(sys.stdout):
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+        writer = asyncio.StreamWriter(transport, protocol, None, loop)
+    else:
+        writer = FileWriter(sys.stdout.buffer)
+
+    await server.serveStream(reader, writer)
+
+async def serveUnix(server, path):
+    """ Serve requests on a Unix domain socket until cancelled
+
+    Args:
+        server: GameServer class object
+        path: Filesystem path of the socket
+
+    """
+    unixServer = await asyncio.start_unix_server(server.serveStream, path)
+
+    async with unixServer:
+        await unixServer.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve many concurrent 2048-puzzle games over a JSON lines protocol")
+    parser.add_argument("--socket", help="Unix socket path to listen on (default: serve stdin/stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="Player AI process pool size (default: CPU count)")
+    parser.add_argument("--max-sessions", type=int, default=defaultMaxSessions, help="maximum number of open sessions")
+    parser.add_argument("--max-in-flight", type=int, default=defaultMaxInFlight, help="maximum number of pending requests per stream")
+    parser.add_argument("--deadline", type=float, default=defaultDeadline, help="default maximum seconds per step")
+    parser.add_argument("--max-size", type=int, default=defaultMaxSize, help="largest grid side size a session may use (default: %d)" % defaultMaxSize)
+    args = parser.parse_args()
+
+    async def run():
+        with ProcessPoolExecutor(args.workers, initializer=initWorker) as pool:
+            loop = asyncio.get_running_loop()
+            workers = args.workers or os.cpu_count() or 1
+            await asyncio.gather(*(loop.run_in_executor(pool, warmWorker) for i in range(workers)))
+
+            server = GameServer(pool, workers, args.max_sessions, args.max_in_flight, args.deadline, args.max_size)
+
+            if args.socket:
+                await serveUnix(server, args.socket)
+            else:
+                await serveStdio(server)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,3 @@
-from copy import deepcopy
-
 directionVectors = (UP_VEC, DOWN_VEC, LEFT_VEC, RIGHT_VEC) = ((-1, 0), (1, 0), (0, -1), (0, 1))
 vecIndex = [UP, DOWN, LEFT, RIGHT] = range(4)
 
@@ -43,8 +41,8 @@ class Grid:
         Returns: Copy of th current grid class object 
         
         """
-        gridCopy = Grid()
-        gridCopy.map = deepcopy(self.map)
+        gridCopy = Grid(self.size)
+        gridCopy.map = [row[:] for row in self.map]
         gridCopy.size = self.size
 
         return gridCopy
@@ -0,0 +1,88 @@
+import argparse
+import random
+import timeit
+
+from Grid import Grid
+from NumpyGrid import NumpyGrid
+
+def randomMap(size, fill, rng):
+    """ Get a random matrix of tile values
+
+    Args:
+        size: Puzzle grid side size
+        fill: Fraction of filled cells
+        rng: Random class object
+
+    Returns: Matrix of tile values
+
+    """
+    return [[2 ** rng.randint(1, 6) if rng.random() < fill else 0 for y in range(size)] for x in range(size)]
+
+def allMoves(grid):
+    """ Apply every move to a copy of the grid, in one pass when the grid supports it
+
+    Args:
+        grid: Grid or NumpyGrid class object
+
+    Returns: List of the moved grids, None where the move changes nothing
+
+    """
+    if hasattr(grid, "allMoves"):
+        return grid.allMoves()
+
+    grids = []
+
+    for dir in range(4):
+        gridCopy = grid.clone()
+        grids.append(gridCopy if gridCopy.move(dir) else None)
+
+    return grids
+
+def timeOperations(grid, number):
+    """ Time the main grid operations
+
+    Args:
+        grid: Grid or NumpyGrid class object
+        number: Calls per operation
+
+    Returns: Dictionary mapping each operation to its mean time per call in microseconds
+
+    """
+    operations = {
+        "getAvailableMoves" : grid.getAvailableMoves,
+        "canMove"           : grid.canMove,
+        "getAvailableCells" : grid.getAvailableCells,
+        "clone + move"      : lambda: grid.clone().move(random.randint(0, 3)),
+        "all four moves"    : lambda: allMoves(grid),
+    }
+
+    return {name: 1e6 * timeit.timeit(operation, number=number) / number for name, operation in operations.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the list-of-lists Grid with the vectorized NumpyGrid")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 8, 16, 32], help="grid side sizes (default: 4 8 16 32)")
+    parser.add_argument("--fill", type=float, default=0.6, help="fraction of filled cells (default: 0.6)")
+    parser.add_argument("--number", type=int, default=200, help="calls per operation (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="random board seed (default: 0)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    print("%-5s %-18s %12s %12s %8s" % ("size", "operation", "Grid (us)", "Numpy (us)", "speedup"))
+
+    for size in args.sizes:
+        values = randomMap(size, args.fill, rng)
+
+        grid = Grid(size)
+        grid.map = [row[:] for row in values]
+        numpyGrid = NumpyGrid(size)
+        numpyGrid.map = values
+
+        listTimes = timeOperations(grid, args.number)
+        numpyTimes = timeOperations(numpyGrid, args.number)
+
+        for name in listTimes:
+            print("%-5d %-18s %12.1f %12.1f %7.2fx" % (size, name, listTimes[name], numpyTimes[name], listTimes[name] / numpyTimes[name]))
+
+if __name__ == '__main__':
+    main()
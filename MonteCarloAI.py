@@ -0,0 +1,215 @@
+from random import Random, choice, randint
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from BaseAI import BaseAI
+from BitGrid import getMoveTable, toBitGrid
+from Grid import vecIndex
+
+import os
+import time
+
+# Initialize static parameters
+defaultProbability = 0.9
+
+# Fewest rollouts every root move needs before their means are trusted
+minRollouts = 4
+
+def rollout(table, board, rng, deadline, depth = None, probability = defaultProbability):
+    """ Play random moves from a packed board until the game is over or the depth is reached
+
+    The score is the number of player moves survived plus the empty cells left on the last
+    board, so that rollouts cut at the same depth are still told apart. A finished game has no
+    empty cells left and scores its moves only.
+
+    Args:
+        table: MoveTable class object of the board size
+        board: Packed board right after the player's move, before the computer's tile
+        rng: Random class object used for the moves and tiles
+        deadline: time.monotonic value after which the rollout is abandoned
+        depth: Maximum number of player moves per rollout (None plays until the game is over)
+        probability: Probability of the new tile being a 2 (4 otherwise)
+
+    Returns: Rollout score, None if the deadline was reached first
+
+    """
+    shift, empty = table.shift, table.empty
+    rowMask, rowOffsets, bits = table.rowMask, table.rowOffsets, table.bits
+    moves = 0
+
+    while depth is None or moves < depth:
+        if not moves % 64 and time.monotonic() >= deadline:
+            return None
+
+        # Computer's turn: new tile in a random empty cell
+        cells = [offset + y * bits for offset in rowOffsets for y in empty[(board >> offset) & rowMask]]
+
+        if cells:
+            board |= (1 if rng.random() < probability else 2) << cells[rng.randrange(len(cells))]
+
+        # Player's turn: random legal move
+        options = []
+
+        for d in vecIndex:
+            moved = shift(board, d)
+
+            if moved != board:
+                options.append(moved)
+
+        if not options:
+            return moves
+
+        board = options[rng.randrange(len(options))]
+        moves += 1
+
+    return moves + sum(len(empty[(board >> offset) & rowMask]) for offset in rowOffsets)
+
+def warmWorker(size):
+    """ Build the move table of the specified size in a pool worker
+
+    Only the side effect matters: the table itself holds lambdas and cannot be sent back.
+
+    Args:
+        size: Puzzle grid side size
+
+    """
+    getMoveTable(size)
+
+def runRollouts(size, board, moves, deadline, seed, depth = None):
+    """ Run rollouts for every root move, one at a time in turn, until the deadline
+
+    Root moves take turns rollout by rollout, so their counts never differ by more than one.
+
+    Args:
+        size: Puzzle grid side size
+        board: Packed board of the current puzzle state
+        moves: Legal root moves
+        deadline: time.monotonic value set by the parent, shared by all workers
+        seed: Seed of this worker's random number generator
+        depth: Maximum number of player moves per rollout (None plays until the game is over)
+
+    Returns: Dictionary mapping each root move to its (total score, rollouts) pair
+
+    """
+    table = getMoveTable(size)
+    rng = Random(seed)
+    roots = {m: table.shift(board, m) for m in moves}
+    results = {m: [0, 0] for m in moves}
+
+    while True:
+        for m, root in roots.items():
+            score = rollout(table, root, rng, deadline, depth)
+
+            if score is None:
+                return {m: tuple(result) for m, result in results.items()}
+
+            results[m][0] += score
+            results[m][1] += 1
+
+class MonteCarloAI(BaseAI):
+    """ Monte Carlo AI class. Picks the root move whose random rollouts score best on average
+
+    Rollouts run on packed BitGrid boards and are spread over a process pool, one task per
+    worker covering every root move, so the number of rollouts per move grows with the number
+    of cores. When some move got fewer than minRollouts rollouts in time (long games on large
+    boards), the means are too noisy and the move leaving the most empty cells is played instead.
+
+    Args:
+        grid: Grid class object with the current state of the puzzle
+        timeLimit: Maximum decision time in seconds
+        workers: Number of processes running rollouts (1 runs them in this process)
+        depth: Maximum number of player moves per rollout (None plays until the game is over)
+
+    Methods:
+        getMove(): Get the Monte Carlo AI's next move. Inherited from Base AI
+        greedyMove(): Get the move leaving the most empty cells
+        close(): Shut down the rollout process pool
+
+    """
+    def __init__(self, timeLimit = 0.2, workers = None, depth = None):
+        self.timeLimit = timeLimit
+        self.depth = depth
+        self.margin = 0.02
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        self.seed = randint(0, 2 ** 32)
+
+        if self.pool:
+            # Start the workers now rather than during the first move
+            wait([self.pool.submit(warmWorker, 4) for i in range(self.workers)])
+
+    def getMove(self, grid):
+        """ Get the Monte Carlo AI's next move. Inherited from Base AI
+
+        Args:
+            grid: Grid class object with the current state of the puzzle
+
+        Returns: Returns the move with the best mean rollout outcome
+
+        """
+        start = time.monotonic()
+        grid = toBitGrid(grid)
+        moves = grid.getAvailableMoves()
+
+        if not moves:
+            return None
+
+        if len(moves) == 1:
+            return moves[0]
+
+        # Absolute deadline, so time spent waiting for a worker to pick up its task counts too
+        deadline = start + max(self.timeLimit - self.margin, 0.001)
+        self.seed += 1
+
+        if self.pool is None:
+            results = [runRollouts(grid.size, grid.board, moves, deadline, self.seed, self.depth)]
+        else:
+            futures = [self.pool.submit(runRollouts, grid.size, grid.board, moves, deadline, self.seed * self.workers + i, self.depth)
+                       for i in range(self.workers)]
+            done, pending = wait(futures, timeout=max(start + self.timeLimit - time.monotonic(), 0))
+
+            for future in pending:
+                future.cancel()
+
+            results = [future.result() for future in done]
+
+        totals = {m: [0, 0] for m in moves}
+
+        for result in results:
+            for m, (total, count) in result.items():
+                totals[m][0] += total
+                totals[m][1] += count
+
+        if any(count < minRollouts for total, count in totals.values()):
+            return self.greedyMove(grid, moves)
+
+        means = {m: total / count for m, (total, count) in totals.items()}
+        best = max(means.values())
+
+        return choice([m for m in moves if means[m] == best])
+
+    def greedyMove(self, grid, moves):
+        """ Get the move leaving the most empty cells
+
+        Args:
+            grid: BitGrid class object with the current state of the puzzle
+            moves: Legal moves
+
+        Returns: Move leaving the most empty cells, ties broken at random
+
+        """
+        emptyCells = {}
+
+        for m in moves:
+            gridCopy = grid.clone()
+            gridCopy.move(m)
+            emptyCells[m] = len(gridCopy.getAvailableCells())
+
+        best = max(emptyCells.values())
+
+        return choice([m for m in moves if emptyCells[m] == best])
+
+    def close(self):
+        """ Shut down the rollout process pool """
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
@@ -0,0 +1,357 @@
+from Grid import vecIndex, UP, DOWN, LEFT, RIGHT
+import numpy as np
+
+# Gather tables already built, one per grid side size
+gatherTables = {}
+
+class GatherTable:
+    """ Gather table class. Size-specialized index arrays reading a flat board as lines
+
+    A gather lists the flat cell indices of the board line after line, every line running in
+    the direction its tiles slide to. Reading the board through it turns any move into sliding
+    the lines of a 1-D array towards their first cell, and writing the result back through the
+    same indices undoes the orientation. The four gathers are also concatenated, with the write
+    indices offset to four separate boards, to compute all moves at once.
+
+    Args:
+        size: Puzzle grid side size
+
+    """
+    def __init__(self, size):
+        cellCount = size * size
+        cells = np.arange(cellCount).reshape(size, size)
+        views = {LEFT: cells, RIGHT: cells[:, ::-1], UP: cells.T, DOWN: cells.T[:, ::-1]}
+
+        self.size = size
+        self.gathers = [np.ascontiguousarray(views[dir]).reshape(-1) for dir in vecIndex]
+        self.allGather = np.concatenate(self.gathers)
+        self.allScatter = np.concatenate([gather + dir * cellCount for dir, gather in enumerate(self.gathers)])
+        self.positions = np.arange(4 * cellCount)
+
+        # Flat index of the first cell of the line holding each position, and the same shifted
+        # above any tile exponent to tell tiles of different lines apart
+        self.lineStart = self.positions // size * size
+        self.lineKey = self.lineStart << 8
+
+def getGatherTable(size):
+    """ Get the gather table for the specified grid side size, building it on first use
+
+    Args:
+        size: Puzzle grid side size
+
+    Returns: GatherTable class object shared by all boards of that size
+
+    """
+    table = gatherTables.get(size)
+
+    if table is None:
+        table = gatherTables[size] = GatherTable(size)
+
+    return table
+
+def slide(table, cells, gather, scatter):
+    """ Slide and merge the tiles of a flat board along the lines read by a gather
+
+    Only the tiles are processed, as one 1-D array in line order. Runs of equal tiles of a line
+    pair up from their first tile, so every odd-ranked tile of a run merges into the tile before
+    it; the remaining tiles are then packed at the start of their lines.
+
+    Args:
+        table: GatherTable class object of the board size
+        cells: Flat array of tile exponents
+        gather: Indices of cells read as consecutive lines
+        scatter: Indices of the result the lines are written back to
+
+    Returns: Flat array of the tile exponents after the move, as long as scatter
+
+    """
+    lines = cells[gather]
+    tiles = lines.nonzero()[0]
+    count = len(tiles)
+    positions = table.positions[:count]
+
+    # Tile exponents in the low 8 bits, line above them
+    key = table.lineKey[tiles] + lines[tiles]
+    runFirst = np.empty(count, dtype=bool)
+    runFirst[:1] = True
+    np.not_equal(key[1:], key[:-1], out=runFirst[1:])
+    odd = (positions - np.maximum.accumulate(positions * runFirst)) & 1
+
+    key[:-1] += odd[1:]
+    keep = odd == 0
+    key = key[keep]
+    starts = table.lineStart[tiles[keep]]
+    count = len(key)
+    positions = positions[:count]
+
+    lineFirst = np.empty(count, dtype=bool)
+    lineFirst[:1] = True
+    np.not_equal(starts[1:], starts[:-1], out=lineFirst[1:])
+
+    # Assigning to the uint8 board keeps the low 8 bits of the keys, the exponents
+    moved = np.zeros(len(scatter), dtype=cells.dtype)
+    moved[scatter[starts + positions - np.maximum.accumulate(positions * lineFirst)]] = key
+
+    return moved
+
+class MapRow(list):
+    """ Map Row class. Row of tile values writing cell assignments through to a NumpyGrid
+
+    Args:
+        grid: NumpyGrid class object the row belongs to
+        x: Row index
+        values: Tile values of the row
+
+    """
+    def __init__(self, grid, x, values):
+        super().__init__(values)
+        self.grid = grid
+        self.x = x
+
+    def __setitem__(self, y, value):
+        super().__setitem__(y, value)
+        self.grid.setCellValue((self.x, y), value)
+
+class NumpyGrid:
+    """ Numpy Grid class. Grid backed by a uint8 matrix of tile exponents
+
+    Moves read the board through a precomputed gather per direction and merge the tiles as one
+    1-D array, a fixed number of NumPy calls whatever the size; all four moves share one pass.
+    Checking which moves are available does not need the moves themselves, only masks of
+    adjacent cell pairs.
+
+    Args:
+        size: Puzzle grid side size
+        pos: Selected cell's grid position
+        value: Value for the computer's new tile to be inserted
+        dir: Selected move direction
+        dirs: Vector defining possible moves in the current puzzle state
+
+    Methods:
+        clone(): Make a copy of the grid in the current puzzle state
+        insertTile(): Insert a tile in an empty cell
+        setCellValue(): Set the new value for the selected cell
+        getAvailableCells(): Get a list of all empty cells
+        getMaxTile(): Return the tile with maximum value
+        canInsert(): Check if it is possible to insert a tile in the specified position
+        move(): Move the grid
+        allMoves(): Apply every move to a copy of the grid, all directions at once
+        movedDirections(): Check which moves change the grid, all directions at once
+        canMove(): Check if the grid has available moves in the current puzzle state
+        getAvailableMoves(): Get the available moves in the current puzzle state
+        crossBound(): Check that the specified position is within the grid (size) limits
+        getCellValue(): Get the current value of the tile in the specified position
+
+    """
+    def __init__(self, size = 4):
+        self.size = size
+        self.cells = np.zeros((size, size), dtype=np.uint8)
+        self.table = getGatherTable(size)
+
+    @property
+    def map(self):
+        """ Matrix of tile values as a list of lists, like Grid.map
+
+        Assigning map[x][y] writes through to the grid and assigning map replaces the board. The
+        lists are a snapshot though: they do not follow later moves, read map again after one.
+
+        """
+        values = np.zeros((self.size, self.size), dtype=np.int64)
+        filled = self.cells != 0
+        values[filled] = np.left_shift(1, self.cells[filled].astype(np.int64))
+
+        return [MapRow(self, x, row) for x, row in enumerate(values.tolist())]
+
+    @map.setter
+    def map(self, values):
+        values = np.asarray(values, dtype=np.int64)
+        cells = np.zeros(values.shape, dtype=np.uint8)
+        filled = values > 0
+        cells[filled] = np.log2(values[filled]).astype(np.uint8)
+
+        self.size = len(cells)
+        self.cells = cells
+        self.table = getGatherTable(self.size)
+
+    def clone(self):
+        """ Make a copy of the grid in the current puzzle state
+
+        Returns: Copy of the current numpy grid class object
+
+        """
+        gridCopy = NumpyGrid.__new__(NumpyGrid)
+        gridCopy.size = self.size
+        gridCopy.cells = self.cells.copy()
+        gridCopy.table = self.table
+
+        return gridCopy
+
+    def insertTile(self, pos, value):
+        """ Insert a tile in an empty cell
+
+        Args:
+            pos: Selected random position for the computer's new tile to be inserted
+            value: Value for the computer's new tile to be inserted
+
+        """
+        self.setCellValue(pos, value)
+
+    def setCellValue(self, pos, value):
+        """ Set the new value for the selected cell
+
+        Args:
+            pos: Selected random position for the computer's new tile to be inserted
+            value: Value for the computer's new tile to be inserted
+
+        """
+        self.cells[pos[0], pos[1]] = int(value).bit_length() - 1 if value else 0
+
+    def getAvailableCells(self):
+        """ Get a list of all empty cells
+
+        Returns: List of all empty cells
+
+        """
+        xs, ys = np.nonzero(self.cells == 0)
+
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def getMaxTile(self):
+        """ Return the tile with maximum value
+
+        Returns: Value of the highest tile in the current puzzle state
+
+        """
+        exponent = int(self.cells.max())
+
+        return 1 << exponent if exponent else 0
+
+    def canInsert(self, pos):
+        """ Check if it is possible to insert a tile in the specified position
+
+        Args:
+            pos: Selected random position for the computer's new tile to be inserted
+
+        Returns: Boolean whether specified position is available (available = True; unavailable = False)
+
+        """
+        return self.getCellValue(pos) == 0
+
+    def move(self, dir):
+        """ Move the grid
+
+        Args:
+            dir: Selected move direction
+
+        Returns: Boolean whether the grid has been successfully moved or not
+
+        """
+        gather = self.table.gathers[int(dir)]
+        cells = self.cells.reshape(-1)
+        moved = slide(self.table, cells, gather, gather)
+
+        if moved.tobytes() == cells.tobytes():
+            return False
+
+        self.cells = moved.reshape(self.size, self.size)
+
+        return True
+
+    def allMoves(self):
+        """ Apply every move to a copy of the grid, all directions at once
+
+        Returns: List indexed by move direction of the moved grids, None where the move changes nothing
+
+        """
+        slid = slide(self.table, self.cells.reshape(-1), self.table.allGather, self.table.allScatter).reshape(4, self.size, self.size)
+        moved = (slid != self.cells).any(axis=(1, 2))
+        grids = []
+
+        for dir in vecIndex:
+            if moved[dir]:
+                gridCopy = NumpyGrid.__new__(NumpyGrid)
+                gridCopy.size = self.size
+                gridCopy.cells = slid[dir]
+                gridCopy.table = self.table
+                grids.append(gridCopy)
+            else:
+                grids.append(None)
+
+        return grids
+
+    def movedDirections(self):
+        """ Check which moves change the grid, all directions at once
+
+        A move changes the grid exactly when some pair of neighbours along it is an empty cell
+        followed by a tile, or two equal tiles.
+
+        Returns: Boolean array indexed by move direction
+
+        """
+        cells = self.cells
+        moved = np.zeros(4, dtype=bool)
+
+        for first, second, towardsFirst, towardsSecond in ((cells[:-1], cells[1:], UP, DOWN), (cells[:, :-1], cells[:, 1:], LEFT, RIGHT)):
+            merge = ((first == second) & (first != 0)).any()
+            moved[towardsFirst] = merge or ((first == 0) & (second != 0)).any()
+            moved[towardsSecond] = merge or ((second == 0) & (first != 0)).any()
+
+        return moved
+
+    def canMove(self, dirs = vecIndex):
+        """ Check if the grid has available moves in the current puzzle state
+
+        Unlike Grid.canMove(), which answers True as soon as any cell is empty, only moves that
+        really change the grid count: an empty board, or one where none of dirs applies, has none.
+
+        Args:
+            dirs: Vector defining possible moves in the current puzzle state
+
+        Returns: Boolean whether there are available moves in the current puzzle state
+
+        """
+        if dirs is vecIndex and not self.cells.all():
+            # Any tile next to the empty cells can slide into them
+            return bool(self.cells.any())
+
+        return bool(self.movedDirections()[list(dirs)].any())
+
+    def getAvailableMoves(self, dirs = vecIndex):
+        """ Get the available moves in the current puzzle state
+
+        Args:
+            dirs: Vector defining possible moves in the current puzzle state
+
+        Returns: List of available moves in the current puzzle state
+
+        """
+        moved = self.movedDirections()
+
+        return [x for x in dirs if moved[x]]
+
+    def crossBound(self, pos):
+        """ Check that the specified position is within the grid (size) limits
+
+        Args:
+            pos: Selected cell's grid position
+
+        Returns: Boolean whether specified position is within the grid (size) limits
+
+        """
+        return pos[0] < 0 or pos[0] >= self.size or pos[1] < 0 or pos[1] >= self.size
+
+    def getCellValue(self, pos):
+        """ Get the current value of the tile in the specified position
+
+        Args:
+            pos: Selected cell's grid position
+
+        Returns: Value of the tile in the specified position
+
+        """
+        if self.crossBound(pos):
+            return None
+
+        exponent = int(self.cells[pos[0], pos[1]])
+
+        return 1 << exponent if exponent else 0
@@ -0,0 +1,301 @@
+from BitGrid import getMoveTable, toBitGrid
+from Grid import directionVectors
+import os
+import struct
+
+# Book file layout: header, then one (board hash, move) record per canonical board
+bookMagic = b"2048BOOK"
+bookHeader = struct.Struct("<8sBBBI")
+bookRecord = struct.Struct("<QB")
+# Keys hash the packed board, books written for another cell width do not match
+bookVersion = 2
+
+defaultBookPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "OpeningBook.bin")
+
+# Board symmetries already built, one list per grid side size
+symmetryTables = {}
+
+def getSymmetries(size):
+    """ Get the 8 symmetries of the square board as packed-board cell permutations
+
+    Args:
+        size: Puzzle grid side size
+
+    Returns: List of (cell shifts, move map) pairs. Cell shifts lists (source, destination) bit
+    offsets, move map gives the image of every move direction under the symmetry
+
+    """
+    symmetries = symmetryTables.get(size)
+
+    if symmetries is not None:
+        return symmetries
+
+    table = getMoveTable(size)
+    n = size - 1
+    symmetries = []
+
+    for t in range(8):
+        transpose, flipV, flipH = t & 4, t & 2, t & 1
+        shifts = []
+
+        for x in range(size):
+            for y in range(size):
+                tx, ty = (y, x) if transpose else (x, y)
+                tx = n - tx if flipV else tx
+                ty = n - ty if flipH else ty
+
+                shifts.append((x * table.rowStride + y * table.bits, tx * table.rowStride + ty * table.bits))
+
+        moveMap = []
+
+        for dx, dy in directionVectors:
+            dx, dy = (dy, dx) if transpose else (dx, dy)
+            moveMap.append(directionVectors.index((-dx if flipV else dx, -dy if flipH else dy)))
+
+        symmetries.append((shifts, tuple(moveMap)))
+
+    symmetryTables[size] = symmetries
+
+    return symmetries
+
+def canonicalBoard(size, board):
+    """ Get the canonical representative of a packed board among its 8 symmetries
+
+    Args:
+        size: Puzzle grid side size
+        board: Packed board integer
+
+    Returns: Canonical packed board and the move map of the symmetry leading to it
+
+    """
+    mask = getMoveTable(size).cellMask
+    best, bestMap = None, None
+
+    for shifts, moveMap in getSymmetries(size):
+        image = 0
+
+        for src, dst in shifts:
+            image |= ((board >> src) & mask) << dst
+
+        if best is None or image < best:
+            best, bestMap = image, moveMap
+
+    return best, bestMap
+
+def boardKey(size, board):
+    """ Hash a canonical packed board into the 64-bit book key """
+    from hashlib import blake2b
+
+    data = board.to_bytes((size * size * getMoveTable(size).bits + 7) // 8, "little")
+
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "little")
+
+class OpeningBook:
+    """ Opening Book class. Best known moves for canonical opening boards
+
+    Args:
+        size: Puzzle grid side size
+        minEmpty: Fewest empty cells among the book boards. Fuller boards skip the lookup
+        entries: Dictionary mapping board keys to canonical moves
+        grid: Grid or BitGrid class object with the current state of the puzzle
+        path: Book file path
+
+    Methods:
+        lookup(): Get the book move for the current puzzle state
+        save(): Write the book to a file
+
+    """
+    def __init__(self, size = 4, minEmpty = 0, entries = None):
+        self.size = size
+        self.minEmpty = minEmpty
+        self.entries = entries if entries is not None else {}
+
+    def lookup(self, grid, emptyCells = None):
+        """ Get the book move for the current puzzle state
+
+        Args:
+            grid: Grid or BitGrid class object with the current state of the puzzle
+            emptyCells: Number of empty cells of the grid, when already known
+
+        Returns: Book move, None if the board is not in the book
+
+        """
+        if grid.size != self.size or not self.entries:
+            return None
+
+        if emptyCells is None:
+            emptyCells = len(grid.getAvailableCells())
+
+        if emptyCells < self.minEmpty:
+            return None
+
+        board = grid.board if hasattr(grid, "board") else toBitGrid(grid).board
+        canonical, moveMap = canonicalBoard(self.size, board)
+        move = self.entries.get(boardKey(self.size, canonical))
+
+        return None if move is None else moveMap.index(move)
+
+    def save(self, path = defaultBookPath):
+        """ Write the book to a file
+
+        Args:
+            path: Book file path
+
+        """
+        with open(path, "wb") as f:
+            f.write(bookHeader.pack(bookMagic, bookVersion, self.size, self.minEmpty, len(self.entries)))
+
+            for key in sorted(self.entries):
+                f.write(bookRecord.pack(key, self.entries[key]))
+
+def loadBook(path = defaultBookPath):
+    """ Read a book file
+
+    Args:
+        path: Book file path
+
+    Returns: OpeningBook class object, None if the file does not exist or is not a book
+
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    if len(data) < bookHeader.size:
+        return None
+
+    magic, version, size, minEmpty, count = bookHeader.unpack_from(data)
+
+    if magic != bookMagic or version != bookVersion or len(data) != bookHeader.size + count * bookRecord.size:
+        return None
+
+    return OpeningBook(size, minEmpty, dict(bookRecord.iter_unpack(data[bookHeader.size:])))
+
+def playGame(size, seed, plies, timeLimit):
+    """ Play a seeded headless game, recording the Player AI moves of its opening
+
+    Args:
+        size: Puzzle grid side size
+        seed: Seed of the game's random number generator
+        plies: Number of opening player moves to record
+        timeLimit: Player AI decision time per move
+
+    Returns: Max tile, number of player moves and list of (packed board, empty cells, move) of the opening
+
+    """
+    import random
+    from GameManager import GameManager
+    from ComputerAI import ComputerAI
+    from PlayerAI import PlayerAI
+
+    random.seed(seed)
+
+    manager = GameManager(size)
+    computerAI = ComputerAI()
+    playerAI = PlayerAI(bookPath = None)
+    playerAI.verbose = False
+    playerAI.timeLimit = timeLimit
+
+    for i in range(manager.initTiles):
+        manager.insertRandomTile()
+
+    opening = []
+    moves = 0
+
+    while not manager.isGameOver():
+        move = playerAI.getMove(manager.grid.clone())
+
+        if move is None or not manager.grid.canMove([move]):
+            break
+
+        if moves < plies:
+            bitGrid = toBitGrid(manager.grid)
+            opening.append((bitGrid.board, len(bitGrid.getAvailableCells()), move))
+
+        manager.grid.move(move)
+        moves += 1
+
+        cell = computerAI.getMove(manager.grid.clone())
+
+        if cell:
+            manager.grid.setCellValue(cell, manager.getNewTileValue())
+
+    return manager.grid.getMaxTile(), moves, opening
+
+def collectBook(size, openings, minGames = 2):
+    """ Collect the recorded openings of several games into an opening book
+
+    Args:
+        size: Puzzle grid side size
+        openings: List of game openings, each a list of (packed board, empty cells, move)
+        minGames: Fewest games reaching a board for it to be recorded
+
+    Returns: OpeningBook class object with the most played move of every recurring canonical board
+
+    """
+    votes = {}
+    emptyCells = {}
+
+    for opening in openings:
+        for board, empty, move in opening:
+            canonical, moveMap = canonicalBoard(size, board)
+            key = boardKey(size, canonical)
+            votes.setdefault(key, [0, 0, 0, 0])[moveMap[move]] += 1
+            emptyCells[key] = empty
+
+    # The tile sum grows with every move, so a game reaches a board at most once and the votes of
+    # a board count the games reaching it. Boards reached by a single game are past the opening
+    entries = {key: counts.index(max(counts)) for key, counts in votes.items() if sum(counts) >= minGames}
+
+    # Fuller boards than any recorded one skip the lookup, so it stops with the opening
+    return OpeningBook(size, min((emptyCells[key] for key in entries), default=0), entries)
+
+def buildBook(size = 4, games = 200, seed = 0, plies = 20, timeLimit = 0.2, keep = 0.25, minGames = 2, workers = None):
+    """ Build an opening book from the openings of the highest-scoring seeded games
+
+    Args:
+        size: Puzzle grid side size
+        games: Number of games to play
+        seed: Seed of the first game, game i uses seed + i
+        plies: Number of opening player moves recorded per game
+        timeLimit: Player AI decision time per move
+        keep: Fraction of the best games (by max tile, then length) whose moves are used
+        minGames: Fewest kept games reaching a board for it to be recorded
+        workers: Number of processes playing games (default: CPU count)
+
+    Returns: OpeningBook class object with the most played move of every recurring canonical board
+
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers) as pool:
+        results = list(pool.map(playGame, [size] * games, range(seed, seed + games), [plies] * games, [timeLimit] * games))
+
+    results.sort(key=lambda result: (result[0], result[1]), reverse=True)
+
+    return collectBook(size, [opening for maxTile, moves, opening in results[:max(1, int(len(results) * keep))]], minGames)
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build a 2048-puzzle opening book from seeded headless games")
+    parser.add_argument("--size", type=int, default=4, help="puzzle grid side size (default: 4)")
+    parser.add_argument("--games", type=int, default=200, help="number of games to play (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game (default: 0)")
+    parser.add_argument("--plies", type=int, default=20, help="opening moves recorded per game (default: 20)")
+    parser.add_argument("--time-limit", type=float, default=0.2, help="Player AI decision time per move (default: 0.2)")
+    parser.add_argument("--keep", type=float, default=0.25, help="fraction of the best games used (default: 0.25)")
+    parser.add_argument("--min-games", type=int, default=2, help="fewest kept games reaching a board for it to be recorded (default: 2)")
+    parser.add_argument("--workers", type=int, default=None, help="processes playing games (default: CPU count)")
+    parser.add_argument("--output", default=defaultBookPath, help="book file path (default: OpeningBook.bin)")
+    args = parser.parse_args()
+
+    book = buildBook(args.size, args.games, args.seed, args.plies, args.time_limit, args.keep, args.min_games, args.workers)
+    book.save(args.output)
+
+    print("%d boards written to %s" % (len(book.entries), args.output))
+
+if __name__ == '__main__':
+    main()
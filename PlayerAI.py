@@ -1,11 +1,27 @@
 from random import choices, sample, randint
 
 from BaseAI import BaseAI
+from BitGrid import toBitGrid
+from OpeningBook import defaultBookPath, loadBook
 
-import numpy as np
-
+import math
 import time
+
+# Deepest search layer, the depth formula explodes on nearly full boards
+maxSearchDepth = 256
+
+# Initial alpha-beta window. It bounds evaluateState() scores, not tile values: the empty-cell
+# term is rescaled to the 4x4 board (at most 12.8) and the log2 term grows by 0.2 per tile
+# doubling, so 4096 stays out of reach on any size and the window is the same for all of them
+initialAlpha, initialBeta = 2, 4096
  
+def log2(x):
+    """ Base 2 logarithm returning -inf at 0 and nan for negative values instead of raising """
+    if x > 0:
+        return math.log2(x)
+
+    return -math.inf if x == 0 else math.nan
+
 class PlayerAI(BaseAI):
     """ Grid class
     
@@ -14,8 +30,10 @@ class PlayerAI(BaseAI):
         alpha: Alpha parameter. Largest value for max across seen children
         beta: Beta parameter. Lowest value for min across seen children
         layer: Tree layer depth
-        prevTime: time.clock object indicating the time when the previous move was decided 
+        prevTime: time.perf_counter value indicating the time when the previous move was decided 
         current_tile: Value of the tile to be evaluated
+        verbose: Boolean. Print the search time of every move (yes, verbose = 1; no, verbose = 0)
+        bookPath: Opening book file checked before searching, loaded on the first move. None disables the book
     
     Methods:
         maximize(): Find the move that maximizes the expected tile value
@@ -26,9 +44,12 @@ class PlayerAI(BaseAI):
         getMove(): Get the Player AI's next move. Inherited from Base AI
         
     """    
-    def __init__(self):
+    def __init__(self, bookPath = defaultBookPath):
         self.timeLimit = 0.2
         self.defaultProbability = 0.9
+        self.verbose = True
+        self.bookPath = bookPath
+        self.book = None
         
     def maximize(self, grid, alpha, beta, layer, prevTime):
         """ Find the move that maximizes the expected tile value
@@ -38,7 +59,7 @@ class PlayerAI(BaseAI):
             alpha: Alpha parameter. Largest value for max across seen children
             beta: Beta parameter. Lowest value for min across seen children
             layer: Tree layer depth
-            prevTime: time.clock object indicating the time when the previous move was decided
+            prevTime: time.perf_counter value indicating the time when the previous move was decided
                 
         Returns: Returns the move expected to maximize the tile value and the value of this tile
         
@@ -78,7 +99,7 @@ class PlayerAI(BaseAI):
             alpha: Alpha parameter. Largest value for max across seen children
             beta: Beta parameter. Lowest value for min across seen children
             layer: Tree layer depth
-            prevTime: time.clock object indicating the time when the previous move was decided
+            prevTime: time.perf_counter value indicating the time when the previous move was decided
                 
         Returns: Returns the move expected to minimize the tile value and the value of this tile
         
@@ -97,7 +118,7 @@ class PlayerAI(BaseAI):
                 break
             
             new_grid = grid.clone()
-            new_grid.map[x][y] = choices([2, 4], [self.defaultProbability, 1 - self.defaultProbability])[0]
+            new_grid.setCellValue((x, y), choices([2, 4], [self.defaultProbability, 1 - self.defaultProbability])[0])
             _, maxmin = self.maximize(new_grid, alpha, beta, layer + 1, prevTime)
                 
             if maxmin < min_tile:
@@ -121,7 +142,7 @@ class PlayerAI(BaseAI):
         Returns: Returns the expected value of the tree
         
         """
-        return 0.2 * np.log2(grid.getMaxTile() - current_tile + 0.0001) + 0.8 * len(grid.getAvailableCells())
+        return 0.2 * log2(grid.getMaxTile() - current_tile + 0.0001) + 0.8 * self.cellScale * len(grid.getAvailableCells())
     
     def isTerminal(self, grid, layer):
         """ Check if it's the last node in a tree either because the game is over or the maximum search depth has been reached
@@ -139,12 +160,12 @@ class PlayerAI(BaseAI):
         """ Check if the maximum decision time has passed
         
         Args:
-            prevTime: time.clock object indicating the time when the previous move was decided 
+            prevTime: time.perf_counter value indicating the time when the previous move was decided 
                 
         Returns: Boolean whether the the maximum decision time is over (time over = True; still time available = False)
         
         """
-        return time.clock() - prevTime >= self.timeLimit
+        return time.perf_counter() - prevTime >= self.timeLimit
 
     def getMove(self, grid):
         """ Get the Player AI's next move. Inherited from Base AI
@@ -155,19 +176,35 @@ class PlayerAI(BaseAI):
         Returns: Returns the optimal player's next move
         
         """
-        prevTime = time.clock()
+        prevTime = time.perf_counter()
+        grid = toBitGrid(grid)
         self.moves = grid.getAvailableMoves()
-        self.max_layer = np.round(np.exp(18/(len(grid.getAvailableCells()) + 3) + 1))
+        emptyCells = len(grid.getAvailableCells())
+        
+        if self.bookPath is not None:
+            self.book, self.bookPath = loadBook(self.bookPath), None
+        
+        if self.book is not None:
+            book_move = self.book.lookup(grid, emptyCells)
+            
+            if book_move in self.moves:
+                return book_move
+        
+        # Empty cells are counted on the 4x4 scale so depth and heuristic weights hold for any size
+        self.cellScale = 16 / (grid.size * grid.size)
+        self.max_layer = round(math.exp(18/(self.cellScale * emptyCells + 3) + 1))
         if self.max_layer % 2 == 1:
             self.max_layer -= 1
+        self.max_layer = min(self.max_layer, maxSearchDepth)
             
-        alpha, beta = 2, 4096
+        alpha, beta = initialAlpha, initialBeta
         layer = 1
     
         if self.moves:    
-            prevTime = time.clock()
+            prevTime = time.perf_counter()
             max_move, max_tile = self.maximize(grid, alpha, beta, layer, prevTime)
-            print(time.clock() - prevTime)
+            if self.verbose:
+                print(time.perf_counter() - prevTime)
             
             if max_move is None:
                 max_move = self.moves[randint(0, len(self.moves) - 1)]
@@ -0,0 +1,98 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+# Child process: import the game, set it up and compute the first Player AI move
+firstMoveScript = """
+import time
+start = time.perf_counter()
+from GameManager import GameManager
+from PlayerAI import PlayerAI
+imported = time.perf_counter()
+gameManager = GameManager(%d)
+for i in range(gameManager.initTiles):
+    gameManager.insertRandomTile()
+playerAI = PlayerAI()
+playerAI.verbose = False
+playerAI.getMove(gameManager.grid.clone())
+print(imported - start, time.perf_counter() - imported, flush=True)
+"""
+
+def importTimes(runs):
+    """ Collect `python -X importtime` reports for importing GameManager
+
+    Args:
+        runs: Number of cold interpreter starts
+
+    Returns: Dictionary mapping each module to its list of cumulative import times in microseconds
+
+    """
+    times = {}
+
+    for i in range(runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import GameManager"],
+                                cwd=here, capture_output=True, text=True, check=True)
+
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+
+            own, cumulative, module = line[len("import time:"):].split("|")
+            times.setdefault(module.strip(), []).append(int(cumulative))
+
+    return times
+
+def firstMoveTimes(runs, size):
+    """ Measure cold-start latency from process launch to the first Player AI move
+
+    Args:
+        runs: Number of cold interpreter starts
+        size: Puzzle grid side size
+
+    Returns: List of (total, import, first move) tuples in seconds
+
+    """
+    samples = []
+
+    for i in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", firstMoveScript % size],
+                                cwd=here, capture_output=True, text=True, check=True)
+        total = time.perf_counter() - start
+
+        imported, firstMove = (float(x) for x in result.stdout.split())
+        samples.append((total, imported, firstMove))
+
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description="Report cold-start import time and latency to the first move")
+    parser.add_argument("--runs", type=int, default=10, help="number of cold starts to measure (default: 10)")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to list (default: 10)")
+    parser.add_argument("--size", type=int, default=4, help="puzzle grid side size (default: 4)")
+    args = parser.parse_args()
+
+    times = importTimes(args.runs)
+
+    print("Slowest imports under GameManager (median cumulative, ms):")
+    ranked = sorted(times.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+
+    for module, values in ranked[:args.top]:
+        print("  %-40s %8.2f" % (module, statistics.median(values) / 1000))
+
+    samples = firstMoveTimes(args.runs, args.size)
+    total, imported, firstMove = (sorted(column) for column in zip(*samples))
+
+    print("")
+    print("Cold start to first move over %d runs (ms):    min   median" % args.runs)
+    print("  process launch to first move            %8.2f %8.2f" % (1000 * total[0], 1000 * statistics.median(total)))
+    print("  game module imports                     %8.2f %8.2f" % (1000 * imported[0], 1000 * statistics.median(imported)))
+    print("  set-up and first search                 %8.2f %8.2f" % (1000 * firstMove[0], 1000 * statistics.median(firstMove)))
+
+if __name__ == '__main__':
+    main()
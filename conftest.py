@@ -0,0 +1,19 @@
+import random
+
+import pytest
+
+from Grid import Grid
+
+@pytest.fixture
+def randomGrids():
+    """ Factory of seeded random Grid objects, few distinct tile values so that merges are frequent """
+    def build(size, count = 200, fill = 0.6):
+        rng = random.Random(size)
+
+        for i in range(count):
+            grid = Grid(size)
+            grid.map = [[2 ** rng.randint(1, 3) if rng.random() < fill else 0 for y in range(size)] for x in range(size)]
+
+            yield grid
+
+    return build
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from BitGrid import BitGrid, FullMoveTable, LineCache, MoveTable, getMoveTable, toBitGrid
+from Grid import vecIndex, LEFT
+
+@pytest.mark.parametrize("size", range(2, 8))
+def test_moves_match_grid(size, randomGrids):
+    for grid in randomGrids(size):
+        bitGrid = toBitGrid(grid)
+
+        assert bitGrid.map == grid.map
+        assert bitGrid.getAvailableMoves() == grid.getAvailableMoves()
+        assert bitGrid.canMove() == bool(bitGrid.getAvailableMoves())
+        assert sorted(bitGrid.getAvailableCells()) == sorted(grid.getAvailableCells())
+        assert bitGrid.getMaxTile() == grid.getMaxTile()
+
+        for dir in vecIndex:
+            gridCopy, bitCopy = grid.clone(), bitGrid.clone()
+
+            assert bitCopy.move(dir) == gridCopy.move(dir)
+            assert bitCopy.map == gridCopy.map
+
+def test_set_cell_value():
+    bitGrid = BitGrid(5)
+    bitGrid.setCellValue((4, 3), 2048)
+    bitGrid.setCellValue((0, 1), 4)
+    bitGrid.setCellValue((0, 1), 0)
+
+    assert bitGrid.getCellValue((4, 3)) == 2048
+    assert bitGrid.getCellValue((0, 1)) == 0
+    assert bitGrid.getCellValue((5, 0)) is None
+    assert bitGrid.toGrid().map == bitGrid.map
+
+def test_can_move_needs_a_real_move():
+    bitGrid = BitGrid(4)
+
+    # Grid.canMove() answers True here, any empty cell counts for it
+    assert not bitGrid.canMove()
+
+    bitGrid.setCellValue((0, 0), 2)
+
+    assert bitGrid.canMove()
+    assert not bitGrid.canMove([0, 2])
+
+@pytest.mark.parametrize("size", [2, 3, 4])
+def test_full_tables_match_built_lines(size):
+    table, lines = FullMoveTable(size), MoveTable(size)
+    rng = random.Random(size)
+
+    for i in range(2000):
+        board = rng.getrandbits(size * table.rowStride)
+
+        for dir in vecIndex:
+            assert table.shift(board, dir) == lines.shift(board, dir)
+
+def test_full_tables_do_not_overflow_cells():
+    table = getMoveTable(4)
+
+    assert table.lines[LEFT][0xFF] == 0xFF
+    assert table.lines[LEFT][0xEE] == 0xF
+
+    with pytest.raises(ValueError):
+        BitGrid(4).setCellValue((0, 0), 65536)
+
+def test_line_cache_stays_bounded():
+    cache = LineCache(lambda key: -key, limit = 4)
+
+    for key in range(10):
+        cache[0]
+        assert cache[key] == -key
+        assert len(cache) + len(cache.previous) <= 8
+
+    # Lines in use survive every turnover
+    assert 0 in cache
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from Grid import vecIndex
+from NumpyGrid import NumpyGrid
+
+@pytest.mark.parametrize("size", range(2, 8))
+def test_moves_match_grid(size, randomGrids):
+    for grid in randomGrids(size):
+        numpyGrid = NumpyGrid(size)
+        numpyGrid.map = grid.map
+
+        assert numpyGrid.map == grid.map
+        assert numpyGrid.getAvailableMoves() == grid.getAvailableMoves()
+        assert numpyGrid.canMove() == bool(numpyGrid.getAvailableMoves())
+        assert sorted(numpyGrid.getAvailableCells()) == sorted(grid.getAvailableCells())
+        assert numpyGrid.getMaxTile() == grid.getMaxTile()
+
+        allMoves = numpyGrid.allMoves()
+
+        for dir in vecIndex:
+            gridCopy, numpyCopy = grid.clone(), numpyGrid.clone()
+            moved = gridCopy.move(dir)
+
+            assert numpyCopy.move(dir) == moved
+            assert numpyCopy.map == gridCopy.map
+            assert (allMoves[dir] is not None) == moved
+
+            if moved:
+                assert allMoves[dir].map == gridCopy.map
+
+def test_can_move_needs_a_real_move():
+    numpyGrid = NumpyGrid(4)
+
+    # Grid.canMove() answers True here, any empty cell counts for it
+    assert not numpyGrid.canMove()
+
+    numpyGrid.setCellValue((0, 0), 2)
+
+    assert numpyGrid.canMove()
+    assert not numpyGrid.canMove([0, 2])
+
+def test_map_writes_through():
+    numpyGrid = NumpyGrid(4)
+    numpyGrid.map[2][1] = 8
+
+    assert numpyGrid.getCellValue((2, 1)) == 8
+    assert json.loads(json.dumps(numpyGrid.map))[2][1] == 8
+
+def test_set_cell_value_accepts_numpy_integers():
+    numpyGrid = NumpyGrid(4)
+    numpyGrid.setCellValue((1, 2), np.int64(16))
+    numpyGrid.insertTile((3, 0), np.uint16(2))
+
+    assert numpyGrid.getCellValue((1, 2)) == 16
+    assert numpyGrid.getCellValue((3, 0)) == 2
@@ -0,0 +1,76 @@
+import pytest
+
+from BitGrid import BitGrid, getMoveTable, toBitGrid
+from Grid import vecIndex
+from OpeningBook import OpeningBook, boardKey, canonicalBoard, collectBook, getSymmetries
+
+def transform(size, board, shifts):
+    """ Apply a symmetry's cell permutation to a packed board """
+    mask = getMoveTable(size).cellMask
+    image = 0
+
+    for src, dst in shifts:
+        image |= ((board >> src) & mask) << dst
+
+    return image
+
+@pytest.mark.parametrize("size", [3, 4, 5])
+def test_symmetries_map_moves(randomGrids, size):
+    table = getMoveTable(size)
+    symmetries = getSymmetries(size)
+
+    assert len(symmetries) == 8
+
+    for grid in randomGrids(size, 50):
+        board = toBitGrid(grid).board
+
+        for shifts, moveMap in symmetries:
+            image = transform(size, board, shifts)
+
+            for dir in vecIndex:
+                assert table.shift(image, moveMap[dir]) == transform(size, table.shift(board, dir), shifts)
+
+@pytest.mark.parametrize("size", [3, 4, 5])
+def test_lookup_on_every_symmetry(randomGrids, size):
+    table = getMoveTable(size)
+
+    for grid in randomGrids(size, 50):
+        board = toBitGrid(grid).board
+        moves = [dir for dir in vecIndex if table.shift(board, dir) != board]
+
+        if not moves:
+            continue
+
+        # Store the first available move of the original board, as the book builder would
+        canonical, moveMap = canonicalBoard(size, board)
+        book = OpeningBook(size, 0, {boardKey(size, canonical): moveMap[moves[0]]})
+        expected = canonicalBoard(size, table.shift(board, moves[0]))[0]
+
+        for shifts, symmetryMap in getSymmetries(size):
+            image = transform(size, board, shifts)
+            move = book.lookup(BitGrid(size, image))
+
+            # Boards with a symmetry of their own have several equivalent moves, compare up to symmetry
+            assert canonicalBoard(size, table.shift(image, move))[0] == expected
+
+def test_collect_keeps_recurring_boards(randomGrids):
+    size = 4
+    shared, first, second = [toBitGrid(grid) for grid in randomGrids(size, 3)]
+    shift = getMoveTable(size).shift
+    shifts, moveMap = getSymmetries(size)[1]
+    empty = len(shared.getAvailableCells())
+
+    # Both games reach the shared board, the second one through a symmetry, and play the same move
+    openings = [
+        [(shared.board, empty, vecIndex[0]), (first.board, 0, vecIndex[0])],
+        [(transform(size, shared.board, shifts), empty, moveMap[vecIndex[0]]), (second.board, 0, vecIndex[1])],
+    ]
+    book = collectBook(size, openings)
+
+    # Only the board reached by both games is recorded, and the lookup stops past its empty cells
+    assert list(book.entries) == [boardKey(size, canonicalBoard(size, shared.board)[0])]
+    assert book.minEmpty == empty
+
+    move = book.lookup(shared)
+
+    assert canonicalBoard(size, shift(shared.board, move))[0] == canonicalBoard(size, shift(shared.board, vecIndex[0]))[0]